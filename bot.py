@@ -1,37 +1,100 @@
 import os
 import discord
 from discord.ext import commands, tasks
-import requests
+import aiohttp
 import json
+import pickle
 import sqlite3
 import logging
-from datetime import datetime
-from gtts import gTTS
-from dotenv import load_dotenv
+from datetime import datetime, timedelta
 from keep_alive import keep_alive  # Ensure you have this module if hosting 24/7.
 import asyncio
 import random
+from itertools import islice
+from functools import lru_cache
 from io import BytesIO
 import re
+from urllib.parse import unquote
 import shutil  # Used to check for FFmpeg
 import time
+import threading
+import queue
+import signal
+from collections import OrderedDict, defaultdict
 
 # -------------------- Logging Setup --------------------
 logging.basicConfig(level=logging.INFO)
+log = logging.getLogger("bot")
+
+# -------------------- JSON Encoding & Decoding --------------------
+# orjson is a much faster C codec; fall back to the stdlib if it isn't installed.
+# json_dumps_pretty returns indented UTF-8 bytes either way.
+try:
+    import orjson
+    json_loads = orjson.loads
+
+    def json_dumps_pretty(obj):
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+except ImportError:
+    json_loads = json.loads
+
+    def json_dumps_pretty(obj):
+        return json.dumps(obj, indent=2, ensure_ascii=False).encode()
 
 # -------------------- Environment Variables & Config --------------------
 # Use an environment variable for the dotenv filename if provided.
-load_dotenv(os.getenv("BOT_TOKEN_FILE", "bot_token.env"))
+# Variables already set in the process environment take precedence.
+try:
+    with open(os.getenv("BOT_TOKEN_FILE", "bot_token.env")) as f:
+        for line in f:
+            line = line.strip()
+            if line and not line.startswith("#") and "=" in line:
+                key, _, value = line.partition("=")
+                os.environ.setdefault(key.strip(), value.strip().strip("'\""))
+except FileNotFoundError:
+    pass
 TOKEN = os.getenv("DISCORD_TOKEN")
 if not TOKEN:
     raise ValueError("DISCORD_TOKEN not found in environment variables.")
 
+# config.pkl is a parsed copy of config.json; it's reused while it's at least as
+# new as the JSON, which skips JSON parsing of a large bad_words list on restarts.
+CONFIG_CACHE_PATH = "config.pkl"
+
+def load_config():
+    try:
+        with open(CONFIG_CACHE_PATH, "rb") as f:
+            if os.fstat(f.fileno()).st_mtime >= os.path.getmtime("config.json"):
+                return pickle.load(f)
+    except FileNotFoundError:
+        pass  # No cache yet (or no config.json, which the JSON read below reports).
+    except Exception as e:
+        log.warning("Ignoring unreadable %s: %s", CONFIG_CACHE_PATH, e)
+    with open("config.json", "rb") as f:
+        loaded = json_loads(f.read())
+    try:
+        tmp_path = CONFIG_CACHE_PATH + ".tmp"
+        with open(tmp_path, "wb") as f:
+            pickle.dump(loaded, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, CONFIG_CACHE_PATH)
+    except OSError as e:
+        log.warning("Couldn't write %s: %s", CONFIG_CACHE_PATH, e)
+    return loaded
+
 try:
-    with open("config.json") as f:
-        config = json.load(f)
+    config = load_config()
 except Exception as e:
     raise ValueError(f"Error loading config.json: {e}")
 
+_config_lock = asyncio.Lock()  # Serializes config updates and save_config() runs.
+
+def save_config():
+    """Write config.json atomically (temp file + rename) so a crash can't leave it truncated."""
+    tmp_path = "config.json.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(json_dumps_pretty(config))
+    os.replace(tmp_path, "config.json")
+
 # Load configurable prefix (default: "!")
 CURRENT_PREFIX = config.get("prefix", "!")
 # Load default voice channel ID and feedback channel ID
@@ -50,126 +113,311 @@ else:
 AUTO_MODERATION_ENABLED = config.get("auto_moderation", False)
 BAD_WORDS = config.get("bad_words", ["badword1", "badword2", "spam"])
 
-# Compile a regex for bad words (using word boundaries to avoid false positives)
-bad_words_pattern = re.compile(r'\b(?:' + '|'.join(map(re.escape, BAD_WORDS)) + r')\b', re.IGNORECASE)
+# Bad-word matching: messages are split into words and checked against a set,
+# which is linear in message length regardless of how many bad words there are.
+# Entries that aren't a single word (phrases) fall back to a word-boundary regex.
+# Caps keep the phrase pattern (and so the per-message cost) bounded.
+# Messages and entries are normalized the same way (casefold + common leetspeak
+# substitutions) so "sp4m" or "$pam" still match "spam".
+MAX_BAD_WORDS = 5000
+MAX_BAD_WORD_LENGTH = 100
+LEET_TABLE = str.maketrans({'4': 'a', '@': 'a', '3': 'e', '1': 'i', '0': 'o', '$': 's'})
+_WORD_RE = re.compile(r"\w+")
+_find_words = _WORD_RE.findall
+BAD_WORDS_SET = frozenset()
+_bad_phrase_search = None  # None when every entry is a single word.
+
+def normalize_content(text):
+    return text.casefold().translate(LEET_TABLE)
+
+def load_bad_words(words):
+    """(Re)build the bad-word matchers. Call when the list changes, never per message."""
+    global BAD_WORDS_SET, _bad_phrase_search
+    capped = [w for w in words if w and len(w) <= MAX_BAD_WORD_LENGTH][:MAX_BAD_WORDS]
+    if len(capped) < len(words):
+        log.warning("Ignoring %d bad_words entries over the size limits.", len(words) - len(capped))
+    normalized = [normalize_content(w) for w in capped]
+    BAD_WORDS_SET = frozenset(w for w in normalized if _WORD_RE.fullmatch(w))
+    # Longest phrases first so overlapping alternatives resolve on the longer match.
+    phrases = sorted((w for w in normalized if not _WORD_RE.fullmatch(w)), key=len, reverse=True)
+    # An alternation of escaped literals can't backtrack catastrophically, and stdlib
+    # re's \b is Unicode-aware (RE2's is ASCII-only), which non-English phrases need.
+    _bad_phrase_search = (re.compile(r'(?i)\b(?:' + '|'.join(map(re.escape, phrases)) + r')\b').search
+                          if phrases else None)
+
+load_bad_words(BAD_WORDS)
+
+def contains_bad_word(content):
+    if not content:
+        return False  # Attachment/embed-only messages: nothing to scan or copy.
+    normalized = normalize_content(content)  # Once per message, not per bad word.
+    if not BAD_WORDS_SET.isdisjoint(_find_words(normalized)):
+        return True
+    return bool(_bad_phrase_search and _bad_phrase_search(normalized))
 
 # Warning cooldown: prevent spamming warnings (in seconds)
 WARNING_COOLDOWN = 60
-# (Global in-memory dictionary removed; we now use the database)
+# Cooldowns persist in the database; a bounded LRU of recent lookups sits in front of it.
+LAST_WARNED_CACHE_SIZE = 10_000
 
 # -------------------- Precheck FFmpeg for TTS --------------------
 TTS_ENABLED = True
 if not shutil.which("ffmpeg"):
-    logging.error("FFmpeg not found! TTS functionality will be disabled.")
+    log.error("FFmpeg not found! TTS functionality will be disabled.")
     TTS_ENABLED = False
 
-# -------------------- Bot Prefix Helper --------------------
-def get_prefix(bot, message):
-    # Allows the prefix to be changed dynamically
-    return CURRENT_PREFIX
+# ffprobe ships with FFmpeg and is used to read video metadata for !analyze.
+FFPROBE_PATH = shutil.which("ffprobe")
+if not FFPROBE_PATH:
+    log.error("ffprobe not found! Video analysis will be disabled.")
 
 # -------------------- Bot Setup --------------------
-intents = discord.Intents.default()
-intents.message_content = True
-intents.guilds = True
-intents.voice_states = True
-intents.members = True
+# Default intents (which already include guilds and voice_states) plus the
+# privileged message_content intent, built as one bitmask. The members intent
+# is not requested: Member converters resolve from mentions, and voice members
+# are cached through voice_states.
+INTENTS_VALUE = discord.Intents.default().value | discord.Intents.message_content.flag
+intents = discord.Intents(value=INTENTS_VALUE)
 
-bot = commands.Bot(command_prefix=get_prefix, intents=intents)
+# The prefix callable is swapped out by !setprefix; mentioning the bot always works too.
+bot = commands.Bot(command_prefix=commands.when_mentioned_or(CURRENT_PREFIX), intents=intents)
+
+# -------------------- Embed Colors --------------------
+COLOR_BLUE = discord.Color.blue()
+COLOR_GREEN = discord.Color.green()
+COLOR_BLURPLE = discord.Color.blurple()
+COLOR_DARK_GRAY = discord.Color.dark_gray()
 
 # -------------------- Database Helper Class --------------------
 DB_NAME = "bot_data.db"
+DB_READER_CONNECTIONS = 4
+WARNING_INSERT = "INSERT INTO warnings (user_id, reason, timestamp) VALUES (?, ?, ?)"
+MOD_LOG_CONTENT_LIMIT = 200  # Deleted-message text kept in mod_logs, in characters.
+MOD_LOGS_SHOWN = 100  # Most recent mod_logs rows !logs pages through.
 
 class Database:
     def __init__(self, db_name):
         self.db_name = db_name
+        # One connection for the process lifetime (autocommit; batches use explicit transactions).
+        self.conn = sqlite3.connect(db_name, check_same_thread=False, isolation_level=None)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute("PRAGMA temp_store=MEMORY")
+        self.conn.execute("PRAGMA cache_size=-20000")  # ~20 MB page cache, kept across queries.
+        self.lock = threading.Lock()  # Serializes use of self.conn across threads.
+        # Queued INSERT rows keyed by SQL statement; written in one transaction by flush().
+        self._pending = defaultdict(list)
+        self._pending_lock = threading.Lock()
+        self.version = 0  # Bumped on every write; lets callers invalidate cached reads.
         self.init_db()
+        # Read-only connections: under WAL, readers don't block the writer or each other.
+        self._readers = queue.SimpleQueue()
+        for _ in range(DB_READER_CONNECTIONS):
+            reader = sqlite3.connect(db_name, check_same_thread=False)
+            reader.execute("PRAGMA query_only=ON")
+            reader.execute("PRAGMA cache_size=-20000")
+            self._readers.put(reader)
+        # Per-user warning counts, loaded once and kept in step with add/clear.
+        self._warning_counts = defaultdict(int, self.execute(
+            "SELECT user_id, COUNT(*) FROM warnings GROUP BY user_id", fetch=True))
+        # Running team totals [kills, damage, placement sum, matches], updated by log_match.
+        self._team_totals = list(self.execute(
+            "SELECT COALESCE(SUM(kills), 0), COALESCE(SUM(damage), 0), COALESCE(SUM(placement), 0), COUNT(*) "
+            "FROM team_stats", fetch=True)[0])
     
     def init_db(self):
-        with sqlite3.connect(self.db_name) as conn:
-            c = conn.cursor()
-            # Table for scrims
-            c.execute('''CREATE TABLE IF NOT EXISTS scrims (
-                         id INTEGER PRIMARY KEY AUTOINCREMENT,
-                         date TEXT,
-                         time TEXT,
-                         event TEXT)''')
-            # Table for team stats
-            c.execute('''CREATE TABLE IF NOT EXISTS team_stats (
-                         id INTEGER PRIMARY KEY AUTOINCREMENT,
-                         kills INTEGER,
-                         damage INTEGER,
-                         placement INTEGER)''')
-            # Table for user-specific stats
-            c.execute('''CREATE TABLE IF NOT EXISTS user_stats (
-                         id INTEGER PRIMARY KEY AUTOINCREMENT,
-                         user_id INTEGER,
-                         kills INTEGER,
-                         damage INTEGER,
-                         placement INTEGER)''')
-            # Table for warnings
-            c.execute('''CREATE TABLE IF NOT EXISTS warnings (
-                         id INTEGER PRIMARY KEY AUTOINCREMENT,
-                         user_id INTEGER,
-                         reason TEXT,
-                         timestamp DATETIME)''')
-            # Table for moderation logs
-            c.execute('''CREATE TABLE IF NOT EXISTS mod_logs (
-                         id INTEGER PRIMARY KEY AUTOINCREMENT,
-                         action TEXT,
-                         timestamp DATETIME)''')
-            # Table for warning cooldown persistence
-            c.execute('''CREATE TABLE IF NOT EXISTS warning_cooldown (
-                         user_id INTEGER PRIMARY KEY,
-                         last_warned TEXT)''')
-            # Add indexes for performance
-            c.execute("CREATE INDEX IF NOT EXISTS idx_user_stats ON user_stats(user_id)")
-            c.execute("CREATE INDEX IF NOT EXISTS idx_warnings ON warnings(user_id)")
-            conn.commit()
+        c = self.conn.cursor()
+        # Table for scrims
+        c.execute('''CREATE TABLE IF NOT EXISTS scrims (
+                     id INTEGER PRIMARY KEY AUTOINCREMENT,
+                     date TEXT,
+                     time TEXT,
+                     event TEXT)''')
+        # Table for team stats
+        c.execute('''CREATE TABLE IF NOT EXISTS team_stats (
+                     id INTEGER PRIMARY KEY AUTOINCREMENT,
+                     kills INTEGER,
+                     damage INTEGER,
+                     placement INTEGER)''')
+        # Table for user-specific stats
+        c.execute('''CREATE TABLE IF NOT EXISTS user_stats (
+                     id INTEGER PRIMARY KEY AUTOINCREMENT,
+                     user_id INTEGER,
+                     kills INTEGER,
+                     damage INTEGER,
+                     placement INTEGER)''')
+        # Table for warnings
+        c.execute('''CREATE TABLE IF NOT EXISTS warnings (
+                     id INTEGER PRIMARY KEY AUTOINCREMENT,
+                     user_id INTEGER,
+                     reason TEXT,
+                     timestamp DATETIME)''')
+        # Table for moderation logs
+        c.execute('''CREATE TABLE IF NOT EXISTS mod_logs (
+                     id INTEGER PRIMARY KEY AUTOINCREMENT,
+                     action TEXT,
+                     timestamp DATETIME,
+                     user_id INTEGER,
+                     content TEXT)''')
+        # Older databases predate the user_id/content columns.
+        for column in ("user_id INTEGER", "content TEXT"):
+            try:
+                c.execute(f"ALTER TABLE mod_logs ADD COLUMN {column}")
+            except sqlite3.OperationalError:
+                pass  # Column already exists.
+        # Table for warning cooldown persistence
+        c.execute('''CREATE TABLE IF NOT EXISTS warning_cooldown (
+                     user_id INTEGER PRIMARY KEY,
+                     last_warned TEXT)''')
+        # Add indexes for performance
+        c.execute("CREATE INDEX IF NOT EXISTS idx_user_stats ON user_stats(user_id)")
+        c.execute("CREATE INDEX IF NOT EXISTS idx_warnings ON warnings(user_id)")
+        c.execute("CREATE INDEX IF NOT EXISTS idx_modlogs_user ON mod_logs(user_id)")
+        # Lets get_scrims() read in (date, time) order without a sort step.
+        c.execute("CREATE INDEX IF NOT EXISTS idx_scrims_date_time ON scrims(date, time)")
     
     def execute(self, query, params=(), fetch=False):
-        with sqlite3.connect(self.db_name) as conn:
-            c = conn.cursor()
-            c.execute(query, params)
-            if fetch:
-                result = c.fetchall()
-                return result
-            conn.commit()
+        with self.lock:
+            # Write queued rows first so reads (and direct writes) see them.
+            self._write_pending()
+            if not fetch:
+                self.conn.execute(query, params)
+                return
+        reader = self._readers.get()
+        try:
+            return reader.execute(query, params).fetchall()
+        finally:
+            self._readers.put(reader)
+    
+    def queue(self, query, params, stamped=False):
+        """Buffer an INSERT; it is written on the next flush() or execute().
+
+        With stamped=True, the flush time (unix seconds) is appended as the last parameter.
+        """
+        with self._pending_lock:
+            self._pending[query, stamped].append(params)
+            self.version += 1
+    
+    def flush(self):
+        """Write all queued rows in a single transaction."""
+        with self.lock:
+            self._write_pending()
+    
+    def close(self):
+        """Flush queued rows and close all connections."""
+        with self.lock:
+            self._write_pending()
+            self.conn.close()
+        for _ in range(DB_READER_CONNECTIONS):
+            self._readers.get().close()
+    
+    def _write_pending(self):
+        # Caller must hold self.lock.
+        with self._pending_lock:
+            if not self._pending:
+                return
+            pending, self._pending = self._pending, defaultdict(list)
+        now = int(time.time())  # One unix timestamp for the whole batch.
+        try:
+            self.conn.execute("BEGIN")
+            for (query, stamped), rows in pending.items():
+                if stamped:
+                    rows = [params + (now,) for params in rows]
+                self.conn.executemany(query, rows)
+            self.conn.execute("COMMIT")
+        except Exception as e:
+            if self.conn.in_transaction:
+                self.conn.execute("ROLLBACK")
+            # Not raised: the caller may be an unrelated read that only triggered the flush.
+            log.warning("Database batch write failed (%s); retrying row by row.", e)
+            self._write_rows(pending, now)
+
+    def _write_rows(self, pending, now):
+        # Caller must hold self.lock. Isolates bad rows so one can't block the rest.
+        retry = defaultdict(list)
+        for (query, stamped), rows in pending.items():
+            for params in rows:
+                try:
+                    self.conn.execute(query, params + (now,) if stamped else params)
+                except sqlite3.OperationalError as e:
+                    # Locked/busy/disk errors are transient: keep the row for the next flush.
+                    retry[query, stamped].append(params)
+                    last_error = e
+                except Exception as e:
+                    log.error("Dropping unwritable row %r for %s: %s", params, query, e)
+        if retry:
+            # Requeue ahead of anything queued meanwhile, so write order is kept.
+            with self._pending_lock:
+                for key, rows in self._pending.items():
+                    retry[key].extend(rows)
+                self._pending = retry
+            log.error("Database write failed; %d rows kept for retry: %s",
+                      sum(map(len, retry.values())), last_error)
     
     # Convenience methods:
     def add_scrim(self, date, time_str, event):
-        self.execute("INSERT INTO scrims (date, time, event) VALUES (?, ?, ?)", (date, time_str, event))
+        self.queue("INSERT INTO scrims (date, time, event) VALUES (?, ?, ?)", (date, time_str, event))
     
     def get_scrims(self):
         return self.execute("SELECT date, time, event FROM scrims ORDER BY date, time", fetch=True)
     
     def log_match(self, kills, damage, placement):
-        self.execute("INSERT INTO team_stats (kills, damage, placement) VALUES (?, ?, ?)", (kills, damage, placement))
+        self.queue("INSERT INTO team_stats (kills, damage, placement) VALUES (?, ?, ?)", (kills, damage, placement))
+        totals = self._team_totals
+        totals[0] += kills
+        totals[1] += damage
+        totals[2] += placement
+        totals[3] += 1
     
-    def get_team_stats(self):
-        return self.execute("SELECT kills, damage, placement FROM team_stats", fetch=True)
+    def get_team_summary(self):
+        total_kills, total_damage, placement_sum, matches = self._team_totals
+        return total_kills, total_damage, (placement_sum / matches if matches else 0), matches
     
     def log_user_match(self, user_id, kills, damage, placement):
-        self.execute("INSERT INTO user_stats (user_id, kills, damage, placement) VALUES (?, ?, ?, ?)",
-                     (user_id, kills, damage, placement))
+        self.queue("INSERT INTO user_stats (user_id, kills, damage, placement) VALUES (?, ?, ?, ?)",
+                   (user_id, kills, damage, placement))
     
     def get_user_stats(self, user_id):
-        result = self.execute("SELECT SUM(kills), SUM(damage), AVG(placement), COUNT(*) FROM user_stats WHERE user_id = ?",
+        result = self.execute("SELECT COALESCE(SUM(kills), 0), COALESCE(SUM(damage), 0), COALESCE(AVG(placement), 0), COUNT(*) "
+                              "FROM user_stats WHERE user_id = ?",
                               (user_id,), fetch=True)
         return result[0] if result else (0, 0, 0, 0)
     
-    def add_mod_log(self, action):
-        self.execute("INSERT INTO mod_logs (action, timestamp) VALUES (?, ?)", (action, datetime.now()))
+    def add_mod_log(self, action, user_id=None, content=None):
+        if content is not None:
+            content = content[:MOD_LOG_CONTENT_LIMIT]
+        self.queue("INSERT INTO mod_logs (action, user_id, content, timestamp) VALUES (?, ?, ?, ?)",
+                   (action, user_id, content), stamped=True)
+    
+    def get_mod_logs(self):
+        # Newest rows only: walks the rowid index backwards and stops at the limit.
+        return self.execute("SELECT action, timestamp, content FROM mod_logs ORDER BY id DESC LIMIT ?",
+                            (MOD_LOGS_SHOWN,), fetch=True)
     
     def add_warning(self, user_id, reason):
-        self.execute("INSERT INTO warnings (user_id, reason, timestamp) VALUES (?, ?, ?)", (user_id, reason, datetime.now()))
+        # Row and count change together under _pending_lock; see clear_warnings().
+        with self._pending_lock:
+            self._pending[WARNING_INSERT, True].append((user_id, reason))
+            self._warning_counts[user_id] += 1
+            self.version += 1
     
     def get_warnings(self, user_id):
-        result = self.execute("SELECT COUNT(*) FROM warnings WHERE user_id = ?", (user_id,), fetch=True)
-        return result[0][0] if result else 0
+        return self._warning_counts.get(user_id, 0)
 
     def clear_warnings(self, user_id):
-        self.execute("DELETE FROM warnings WHERE user_id = ?", (user_id,))
+        # Runs in a worker thread while add_warning() may run on the event loop.
+        with self.lock:
+            self._write_pending()
+            # Holding _pending_lock keeps add_warning() out until the DELETE and the count
+            # reset are both done. Rows queued since the flush above are invisible to the
+            # DELETE, so drop this user's from the queue too.
+            with self._pending_lock:
+                queued = self._pending.get((WARNING_INSERT, True))
+                if queued:
+                    queued[:] = [row for row in queued if row[0] != user_id]
+                self.conn.execute("DELETE FROM warnings WHERE user_id = ?", (user_id,))
+                self._warning_counts.pop(user_id, None)
+                self.version += 1
     
     # New methods for persistent warning cooldown:
     def get_last_warning(self, user_id):
@@ -179,16 +427,86 @@ class Database:
     def update_last_warning(self, user_id, timestamp):
         self.execute("REPLACE INTO warning_cooldown (user_id, last_warned) VALUES (?, ?)", (user_id, timestamp))
 
+    def prune_warning_cooldowns(self, cutoff):
+        # ISO timestamps compare correctly as strings.
+        self.execute("DELETE FROM warning_cooldown WHERE last_warned < ?", (cutoff,))
+
 db = Database(DB_NAME)
 
+# Queued writes are committed in batches off the event loop.
+DB_FLUSH_INTERVAL = 0.2
+
+@tasks.loop(seconds=DB_FLUSH_INTERVAL)
+async def flush_database_writes():
+    try:
+        await asyncio.get_running_loop().run_in_executor(None, db.flush)
+    except Exception as e:
+        log.error("Database flush error: %s", e)
+
+# Cooldown rows older than WARNING_COOLDOWN no longer suppress anything; drop them
+# so the table tracks recent offenders rather than everyone ever warned.
+COOLDOWN_PRUNE_INTERVAL = 3600
+
+@tasks.loop(seconds=COOLDOWN_PRUNE_INTERVAL)
+async def prune_warning_cooldowns():
+    cutoff = (datetime.utcnow() - timedelta(seconds=WARNING_COOLDOWN)).isoformat()
+    try:
+        await asyncio.to_thread(db.prune_warning_cooldowns, cutoff)
+    except Exception as e:
+        log.error("Warning cooldown prune error: %s", e)
+
+# -------------------- Page Builders & Cache --------------------
+PAGE_SIZE = 5
+
+def page_count(rows):
+    return (len(rows) - 1) // PAGE_SIZE + 1
+
+def build_scrim_page(scrims, index):
+    """Build one !scrims embed."""
+    page_scrims = scrims[index*PAGE_SIZE:(index+1)*PAGE_SIZE]
+    description = "\n".join([f"**{date} {time_str}** - {event}" for date, time_str, event in page_scrims])
+    embed = discord.Embed(title="📅 Upcoming Scrims", description=description, color=COLOR_BLUE)
+    embed.set_footer(text=f"Page {index + 1} of {page_count(scrims)}")
+    return embed
+
+def format_timestamp(value):
+    # Rows written before the switch to unix seconds hold the datetime as text.
+    return f"<t:{value}:f>" if isinstance(value, int) else value
+
+def build_log_page(logs_data, index):
+    """Build one !logs embed (newest first)."""
+    page_logs = logs_data[index*PAGE_SIZE:(index+1)*PAGE_SIZE]
+    log_messages = "\n".join([f"{format_timestamp(timestamp)}: {action}" + (f": {content}" if content else "")
+                              for action, timestamp, content in page_logs])
+    embed = discord.Embed(title="📜 Moderation Logs", description=log_messages, color=COLOR_DARK_GRAY)
+    embed.set_footer(text=f"Page {index + 1} of {page_count(logs_data)}")
+    return embed
+
+# Query results are reused until the TTL expires or the database is written to.
+PAGE_CACHE_TTL = 10
+_page_cache = {}  # {name: (loaded_at, db_version, rows)}
+
+async def cached_rows(name, load):
+    now = time.monotonic()
+    cached = _page_cache.get(name)
+    if cached and cached[1] == db.version and now - cached[0] < PAGE_CACHE_TTL:
+        return cached[2]
+    version = db.version
+    rows = await asyncio.to_thread(load)
+    _page_cache[name] = (now, version, rows)
+    return rows
+
 # -------------------- Pagination Helper Function --------------------
-async def paginate(ctx, pages, timeout=60):
-    """Simple reaction-based pagination for a list of embeds."""
-    if not pages:
+# Clicks arriving within this many seconds of each other are applied as one edit.
+PAGINATION_DEBOUNCE = 0.4
+
+async def paginate(ctx, render, total_pages, timeout=60):
+    """Simple reaction-based pagination; render(index) builds the embed for a page on demand."""
+    if total_pages < 1:
         return
     current = 0
-    message = await ctx.send(embed=pages[current])
-    if len(pages) == 1:
+    message = await ctx.send(embed=render(current))
+    if total_pages == 1:
         return
     await message.add_reaction("⬅️")
     await message.add_reaction("➡️")
@@ -200,35 +518,134 @@ async def paginate(ctx, pages, timeout=60):
             and reaction.message.id == message.id
         )
 
+    async def step(reaction, user):
+        # Removing the reaction right away lets the user click the same arrow again.
+        await message.remove_reaction(reaction, user)
+        return -1 if str(reaction.emoji) == "⬅️" else 1
+
     while True:
         try:
             reaction, user = await bot.wait_for("reaction_add", timeout=timeout, check=check)
-            if str(reaction.emoji) == "⬅️":
-                current = (current - 1) % len(pages)
-            elif str(reaction.emoji) == "➡️":
-                current = (current + 1) % len(pages)
-            await message.edit(embed=pages[current])
-            await message.remove_reaction(reaction, user)
         except asyncio.TimeoutError:
             break
+        offset = await step(reaction, user)
+        # Fold a burst of clicks into one edit instead of editing per click.
+        while True:
+            try:
+                reaction, user = await bot.wait_for("reaction_add", timeout=PAGINATION_DEBOUNCE, check=check)
+            except asyncio.TimeoutError:
+                break
+            offset += await step(reaction, user)
+        new_page = (current + offset) % total_pages
+        if new_page != current:
+            current = new_page
+            await message.edit(embed=render(current))
+
+# -------------------- HTTP Helper --------------------
+# Shared aiohttp session (bot.http_session) is created in main() at startup.
+HTTP_TIMEOUT = 5
+HTTP_LIMIT_PER_HOST = 4  # Cap concurrent requests to any one fun API.
+
+async def fetch_json(url):
+    """GET a JSON API through the shared session without blocking the event loop."""
+    async with bot.http_session.get(url) as response:
+        response.raise_for_status()
+        # Some of the APIs don't send an application/json content type.
+        return await response.json(content_type=None, loads=json_loads)
+
+# -------------------- Rate-Limit Retry Helper --------------------
+async def _rl_safe(coro_factory, *, max_retries=3):
+    """Await coro_factory(), backing off on HTTP 429 using Discord's Retry-After header."""
+    for attempt in range(max_retries + 1):
+        try:
+            return await coro_factory()
+        except discord.HTTPException as e:
+            if e.status != 429 or attempt == max_retries:
+                raise
+            retry_after = float(e.response.headers.get("Retry-After", 1)) * (2 ** attempt)
+            log.warning("Rate limited; retrying in %.1fs", retry_after)
+            await asyncio.sleep(retry_after)
 
 # -------------------- Persistent 24/7 Voice Connection --------------------
-@tasks.loop(minutes=1)  # Reduced interval from 5 minutes to 1 minute.
+# Resolved default voice channel; cleared when the channel is deleted or updated.
+_cached_vc = None
+
+# Reconnects are event-driven; the periodic task is only a slow safety net.
+VOICE_WATCHDOG_INTERVAL = 1800
+# Reconnect backoff: the delay doubles after each failed attempt (5s, 10s, 20s, ...),
+# plus up to 10% jitter. After VOICE_RECONNECT_MAX_ATTEMPTS the watchdog takes over.
+VOICE_RECONNECT_BASE_DELAY = 5
+VOICE_RECONNECT_MAX_DELAY = 3600
+VOICE_RECONNECT_MAX_ATTEMPTS = 8
+_reconnect_task = None
+
+async def _resolve_default_voice_channel():
+    """Return the default VoiceChannel (memoized in _cached_vc), or None if it's missing."""
+    global _cached_vc
+    if _cached_vc is not None:
+        return _cached_vc
+    # The gateway cache holds every guild channel once the bot is ready,
+    # so there's no need for a REST fetch_channel call.
+    channel = bot.get_channel(DEFAULT_VOICE_CHANNEL_ID)
+    if channel is None and not bot.is_ready():
+        await bot.wait_until_ready()
+        channel = bot.get_channel(DEFAULT_VOICE_CHANNEL_ID)
+    # Type check runs only on a cache miss, never on the steady-state path.
+    if channel is not None and not isinstance(channel, discord.VoiceChannel):
+        log.error("default_voice_channel_id %s is not a voice channel", DEFAULT_VOICE_CHANNEL_ID)
+        return None
+    _cached_vc = channel
+    return channel
+
+async def connect_default_voice():
+    """Connect to the default voice channel if needed. Returns False on failure."""
+    default_channel = await _resolve_default_voice_channel()
+    if default_channel is None:
+        log.error("Default voice channel not found")
+        return False
+    # A guild has at most one voice client, so this lookup replaces any scan of
+    # bot.voice_clients. It may sit elsewhere in the guild (e.g. after !coach).
+    guild_client = default_channel.guild.voice_client
+    if guild_client and guild_client.channel.id == DEFAULT_VOICE_CHANNEL_ID:
+        return True
+    try:
+        if guild_client:
+            if guild_client.is_playing():
+                return True  # Don't cut off TTS playback; retry next tick.
+            await _rl_safe(lambda: guild_client.move_to(default_channel))
+        else:
+            await _rl_safe(default_channel.connect)
+        log.info("Connected to default voice channel: %s", default_channel.name)
+    except Exception as e:
+        log.error("Error connecting to default voice channel: %s", e)
+        return False
+    return True
+
+async def _reconnect_with_backoff():
+    delay = VOICE_RECONNECT_BASE_DELAY
+    for attempt in range(1, VOICE_RECONNECT_MAX_ATTEMPTS + 1):
+        await asyncio.sleep(delay + random.uniform(0, delay / 10))
+        if await connect_default_voice():
+            return
+        delay = min(delay * 2, VOICE_RECONNECT_MAX_DELAY)
+        log.warning("Voice reconnection attempt %d/%d failed.", attempt, VOICE_RECONNECT_MAX_ATTEMPTS)
+    log.error("Giving up on voice reconnection until the next watchdog check.")
+
+def schedule_voice_reconnect():
+    """Start a backoff reconnect unless one is already in progress."""
+    global _reconnect_task
+    if _reconnect_task is None or _reconnect_task.done():
+        _reconnect_task = asyncio.create_task(_reconnect_with_backoff())
+
+@tasks.loop(seconds=VOICE_WATCHDOG_INTERVAL)
 async def maintain_default_voice_connection():
-    """Ensure the bot stays connected to the default voice channel 24/7."""
-    default_channel = bot.get_channel(DEFAULT_VOICE_CHANNEL_ID)
-    if not default_channel or not isinstance(default_channel, discord.VoiceChannel):
-        logging.error("Default voice channel not found or invalid")
-        return
+    """Safety net: ensure the bot stays connected to the default voice channel 24/7."""
+    if not await connect_default_voice():
+        schedule_voice_reconnect()
 
-    # Check if already connected to the default channel
-    connected = any(vc.channel.id == DEFAULT_VOICE_CHANNEL_ID for vc in bot.voice_clients)
-    if not connected:
-        try:
-            await default_channel.connect()
-            logging.info(f"Connected to default voice channel: {default_channel.name}")
-        except Exception as e:
-            logging.error(f"Error connecting to default voice channel: {e}")
+@maintain_default_voice_connection.before_loop
+async def before_maintain_default_voice_connection():
+    await bot.wait_until_ready()
 
 # -------------------- Commands --------------------
 
@@ -238,15 +655,18 @@ async def maintain_default_voice_connection():
 async def set_prefix(ctx, new_prefix: str):
     """Change the bot command prefix. Usage: !setprefix <new_prefix>"""
     global CURRENT_PREFIX, config
-    CURRENT_PREFIX = new_prefix
-    config["prefix"] = new_prefix
     try:
-        with open("config.json", "w") as f:
-            json.dump(config, f, indent=4)
+        # One save at a time: overlapping writers would share config.json.tmp, and the
+        # last update applied must also be the last one written.
+        async with _config_lock:
+            CURRENT_PREFIX = new_prefix
+            bot.command_prefix = commands.when_mentioned_or(new_prefix)
+            config["prefix"] = new_prefix
+            await asyncio.to_thread(save_config)  # File write + rename stays off the event loop.
         await ctx.send(f"✅ Prefix updated to: `{new_prefix}`")
     except Exception as e:
         await ctx.send("❌ Error updating prefix in config file.")
-        logging.error(f"Set prefix error: {e}")
+        log.error("Set prefix error: %s", e)
 
 # 1. Scrim Scheduler Commands
 @bot.command(name="schedule")
@@ -268,32 +688,26 @@ async def schedule_scrim(ctx, date: str, time_str: str, *, event: str):
         await ctx.send(f"✅ Scrim scheduled: {date} {time_str} - {event}")
     except Exception as e:
         await ctx.send(f"❌ Error scheduling scrim: {e}")
-        logging.error(f"Schedule scrim error: {e}")
+        log.error("Schedule scrim error: %s", e)
 
 @bot.command(name="scrims")
 async def scrims_list(ctx):
     """List all scheduled scrims. Pagination is used if there are many scrims."""
     try:
-        scrims = db.get_scrims()
+        scrims = await cached_rows("scrims", db.get_scrims)
         if not scrims:
             await ctx.send("📅 No scrims scheduled.")
             return
-
-        # Create pages (5 scrims per page)
-        per_page = 5
-        pages = []
-        for i in range(0, len(scrims), per_page):
-            page_scrims = scrims[i:i+per_page]
-            description = "\n".join([f"**{date} {time_str}** - {event}" for date, time_str, event in page_scrims])
-            embed = discord.Embed(title="📅 Upcoming Scrims", description=description, color=discord.Color.blue())
-            embed.set_footer(text=f"Page {i//per_page + 1} of {((len(scrims)-1)//per_page)+1}")
-            pages.append(embed)
-        await paginate(ctx, pages)
+        await paginate(ctx, lambda i: build_scrim_page(scrims, i), page_count(scrims))
     except Exception as e:
         await ctx.send(f"❌ Error fetching scrims: {e}")
-        logging.error(f"Scrims list error: {e}")
+        log.error("Scrims list error: %s", e)
 
 # 2. Team Performance Tracker & User-Specific Stats Commands
+# Sanity bounds for one match; also keeps values inside SQLite's 64-bit INTEGER.
+MAX_MATCH_KILLS = 1000
+MAX_MATCH_DAMAGE = 1_000_000
+MAX_MATCH_PLACEMENT = 100
 @bot.command(name="logmatch")
 @commands.has_role("Team Captain")  # Only users with the "Team Captain" role can log a match.
 async def log_match_command(ctx, kills: int, damage: int, placement: int):
@@ -302,57 +716,92 @@ async def log_match_command(ctx, kills: int, damage: int, placement: int):
     Usage: !logmatch <kills> <damage> <placement>
     This command logs the match for both team and the user.
     """
+    if not (0 <= kills <= MAX_MATCH_KILLS and 0 <= damage <= MAX_MATCH_DAMAGE
+            and 1 <= placement <= MAX_MATCH_PLACEMENT):
+        await ctx.send(f"❌ Invalid stats. Kills must be 0-{MAX_MATCH_KILLS}, damage 0-{MAX_MATCH_DAMAGE} "
+                       f"and placement 1-{MAX_MATCH_PLACEMENT}.")
+        return
     try:
         db.log_match(kills, damage, placement)
         db.log_user_match(ctx.author.id, kills, damage, placement)
         await ctx.send(f"📊 Match logged: {kills} kills, {damage} damage, placement {placement}")
     except Exception as e:
         await ctx.send(f"❌ Error logging match: {e}")
-        logging.error(f"Log match error: {e}")
+        log.error("Log match error: %s", e)
 
 @bot.command(name="teamstats")
 async def team_stats_command(ctx):
     """Display team stats summary."""
     try:
-        stats = db.get_team_stats()
-        if not stats:
+        total_kills, total_damage, avg_placement, matches = db.get_team_summary()
+        if matches == 0:
             await ctx.send("📊 No matches logged yet.")
             return
-        total_kills = sum(s[0] for s in stats)
-        total_damage = sum(s[1] for s in stats)
-        avg_placement = sum(s[2] for s in stats) / len(stats)
         await ctx.send(f"📊 **Team Stats Summary:**\nKills: {total_kills}\nDamage: {total_damage}\nAvg Placement: {avg_placement:.2f}")
     except Exception as e:
         await ctx.send(f"❌ Error fetching team stats: {e}")
-        logging.error(f"Team stats error: {e}")
+        log.error("Team stats error: %s", e)
 
 @bot.command(name="mystats")
 async def my_stats_command(ctx):
     """Display your personal match stats."""
     try:
-        kills, damage, avg_placement, matches = db.get_user_stats(ctx.author.id)
+        kills, damage, avg_placement, matches = await asyncio.to_thread(db.get_user_stats, ctx.author.id)
         if matches == 0:
             await ctx.send("📊 You haven't logged any matches yet.")
         else:
             await ctx.send(f"📊 **Your Stats:**\nMatches: {matches}\nKills: {kills}\nDamage: {damage}\nAvg Placement: {avg_placement:.2f}")
     except Exception as e:
         await ctx.send("❌ Error fetching your stats.")
-        logging.error(f"MyStats error: {e}")
+        log.error("MyStats error: %s", e)
 
 @bot.command(name="playerstats")
 async def player_stats_command(ctx, member: discord.Member):
     """Display the match stats for a mentioned user."""
     try:
-        kills, damage, avg_placement, matches = db.get_user_stats(member.id)
+        kills, damage, avg_placement, matches = await asyncio.to_thread(db.get_user_stats, member.id)
         if matches == 0:
             await ctx.send(f"📊 {member.mention} hasn't logged any matches yet.")
         else:
             await ctx.send(f"📊 **Stats for {member.display_name}:**\nMatches: {matches}\nKills: {kills}\nDamage: {damage}\nAvg Placement: {avg_placement:.2f}")
     except Exception as e:
         await ctx.send("❌ Error fetching player stats.")
-        logging.error(f"PlayerStats error: {e}")
+        log.error("PlayerStats error: %s", e)
 
 # 3. AI Coaching Command (with TTS enhancements)
+# Upper bound on a single coach clip; guards against a stalled FFmpeg player.
+TTS_PLAYBACK_TIMEOUT = 120
+TTS_CACHE_SIZE = 128
+
+async def fetch_coach_quote():
+    """Fetch a random quote from the Quotable API, falling back to a stock line."""
+    try:
+        data = await fetch_json("https://api.quotable.io/random")
+        advice = data.get("content", "Keep practicing!")
+        author = data.get("author", "")
+        return f"{advice} - {author}" if author else advice
+    except Exception as e:
+        log.error("Coach API error: %s", e)
+        return "Keep practicing and never give up!"
+
+async def join_voice_channel(ctx, channel):
+    """Move the guild's voice client to channel (or connect) and return it."""
+    if ctx.voice_client:
+        await ctx.voice_client.move_to(channel)
+        return ctx.voice_client
+    return await channel.connect()
+
+@lru_cache(maxsize=TTS_CACHE_SIZE)
+def tts_bytes(text):
+    """Render text to MP3 bytes with gTTS (blocking; run in an executor).
+
+    Quotes repeat, so recent renders are cached and skip the Google round trip.
+    """
+    from gtts import gTTS  # Imported on first TTS use to keep startup lean.
+    audio_fp = BytesIO()
+    gTTS(text, lang='en').write_to_fp(audio_fp)
+    return audio_fp.getvalue()
+
 @bot.command(name="coach")
 async def coach_command(ctx, *, topic: str = None):
     """
@@ -387,46 +836,66 @@ async def coach_command(ctx, *, topic: str = None):
             await ctx.send(f"🎮 **Coach Advice on {topic.capitalize()}**: {advice}")
             return
 
-    # Fallback: fetch a random quote from the Quotable API.
-    try:
-        response = requests.get("https://api.quotable.io/random", timeout=5)
-        response.raise_for_status()
-        data = response.json()
-        advice = data.get("content", "Keep practicing!")
-        author = data.get("author", "")
-        full_advice = f"{advice} - {author}" if author else advice
-    except Exception as e:
-        full_advice = "Keep practicing and never give up!"
-        logging.error(f"Coach API error: {e}")
-
+    # Fallback: a random quote from the Quotable API.
     # Use TTS if the user is in a voice channel (and not in the default channel) and if TTS is enabled.
     user_vc = ctx.author.voice.channel if (ctx.author and ctx.author.voice) else None
-    if user_vc and user_vc.id != DEFAULT_VOICE_CHANNEL_ID and TTS_ENABLED:
-        try:
-            if ctx.voice_client:
-                vc = await ctx.voice_client.move_to(user_vc)
-            else:
-                vc = await user_vc.connect()
-            tts = gTTS(full_advice, lang='en')
-            audio_fp = BytesIO()
-            tts.write_to_fp(audio_fp)
-            audio_fp.seek(0)
-            vc.play(discord.FFmpegPCMAudio(audio_fp, pipe=True))
-            while vc.is_playing():
-                await asyncio.sleep(1)
-            # Wait a bit then check if the channel still has other members before disconnecting.
-            await asyncio.sleep(5)
-            if len(vc.channel.members) == 1:  # only the bot is left
-                await vc.disconnect()
-            else:
-                logging.info("Other users detected in voice channel; not disconnecting TTS connection.")
-        except Exception as e:
-            await ctx.send(f"❌ Error during TTS playback: {e}")
-            logging.error(f"Coach TTS error: {e}")
-    else:
+    if not (user_vc and user_vc.id != DEFAULT_VOICE_CHANNEL_ID and TTS_ENABLED):
+        full_advice = await fetch_coach_quote()
         await ctx.send(f"🎮 **Coach Says:** {full_advice}")
+        return
+    try:
+        # The quote request and the voice connection are independent; overlap them.
+        full_advice, vc = await asyncio.gather(fetch_coach_quote(), join_voice_channel(ctx, user_vc))
+        loop = asyncio.get_running_loop()
+        # gTTS makes a blocking HTTP request; keep it off the event loop.
+        audio = await loop.run_in_executor(None, tts_bytes, full_advice)
+        done = loop.create_future()
+
+        def finish(err):
+            if not done.done():
+                done.set_result(err)
+
+        # The after callback runs on the player thread, so hand off to the loop.
+        vc.play(discord.FFmpegPCMAudio(BytesIO(audio), pipe=True),
+                after=lambda err: loop.call_soon_threadsafe(finish, err))
+        try:
+            err = await asyncio.wait_for(done, timeout=TTS_PLAYBACK_TIMEOUT)
+            if err:
+                log.error("TTS playback error: %s", err)
+        except asyncio.TimeoutError:
+            log.warning("TTS playback did not finish in %ss; stopping it.", TTS_PLAYBACK_TIMEOUT)
+            vc.stop()
+        # Check if the channel still has other members before disconnecting.
+        if len(vc.channel.members) == 1:  # only the bot is left
+            await vc.disconnect()
+        else:
+            log.info("Other users detected in voice channel; not disconnecting TTS connection.")
+    except Exception as e:
+        await ctx.send(f"❌ Error during TTS playback: {e}")
+        log.error("Coach TTS error: %s", e)
+
+# 4. Video Analysis for AI Coaching (with ffprobe)
+async def run_ffprobe(target, stdin_data=None):
+    """Return (video_stream, format) metadata dicts from ffprobe, or None if unreadable."""
+    proc = await asyncio.create_subprocess_exec(
+        FFPROBE_PATH, "-v", "error", "-print_format", "json",
+        "-show_streams", "-show_format", "-select_streams", "v:0", target,
+        stdin=asyncio.subprocess.PIPE if stdin_data is not None else asyncio.subprocess.DEVNULL,
+        stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.DEVNULL)
+    out, _ = await proc.communicate(stdin_data)
+    try:
+        info = json.loads(out)
+    except ValueError:
+        return None
+    streams = info.get("streams") or []
+    if not streams or not streams[0].get("width"):
+        return None
+    return streams[0], info.get("format", {})
+
+def write_file(path, data):
+    with open(path, "wb") as f:
+        f.write(data)
 
-# 4. Video Analysis for AI Coaching (with OpenCV check)
 @bot.command(name="analyze")
 async def analyze_command(ctx):
     """Analyze an uploaded video and provide improvement suggestions."""
@@ -438,29 +907,34 @@ async def analyze_command(ctx):
     if attachment.size > 50 * 1024 * 1024:
         await ctx.send("❌ Video file too large. Maximum allowed size is 50MB.")
         return
+    if not FFPROBE_PATH:
+        await ctx.send("❌ Video analysis is unavailable: FFmpeg (ffprobe) is not installed.")
+        return
     try:
         video_bytes = await attachment.read()
-        # Generate a unique temporary filename using the message ID
-        temp_filename = f"temp_video_{ctx.message.id}.mp4"
-        with open(temp_filename, "wb") as f:
-            f.write(video_bytes)
-        try:
-            import cv2
-        except ImportError:
-            await ctx.send("❌ OpenCV is not installed. Please install it using `pip install opencv-python`.")
-            os.remove(temp_filename)
-            return
-        cap = cv2.VideoCapture(temp_filename)
-        if not cap.isOpened():
+        # Probe straight from memory; only metadata is read, nothing is decoded.
+        probed = await run_ffprobe("pipe:0", video_bytes)
+        if probed is None:
+            # MP4s with the index at the end can't be read from a pipe; retry from a file.
+            # Up to 50 MB of disk I/O; keep it off the event loop.
+            temp_filename = f"temp_video_{ctx.message.id}.mp4"
+            await asyncio.to_thread(write_file, temp_filename, video_bytes)
+            try:
+                probed = await run_ffprobe(temp_filename)
+            finally:
+                await asyncio.to_thread(os.remove, temp_filename)
+        if probed is None:
             await ctx.send("❌ Could not open the video file.")
-            os.remove(temp_filename)
             return
-        frame_count = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
-        width = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
-        height = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
-        fps = cap.get(cv2.CAP_PROP_FPS)
-        cap.release()
-        os.remove(temp_filename)
+        stream, container = probed
+        width = stream.get("width", 0)
+        height = stream.get("height", 0)
+        num, _, den = stream.get("r_frame_rate", "0/1").partition("/")
+        fps = float(num) / float(den) if float(den or 0) else 0.0
+        frame_count = int(stream.get("nb_frames") or 0)
+        if not frame_count:
+            duration = float(stream.get("duration") or container.get("duration") or 0)
+            frame_count = round(duration * fps)
         feedback = (f"✅ **Video Analysis Complete:**\n"
                     f"- Resolution: {width}x{height}\n"
                     f"- Total Frames: {frame_count}\n"
@@ -469,7 +943,7 @@ async def analyze_command(ctx):
         await ctx.send(feedback)
     except Exception as e:
         await ctx.send(f"❌ Error processing video: {e}")
-        logging.error(f"Video analysis error: {e}")
+        log.error("Video analysis error: %s", e)
 
 # 5. Auto-Moderation Commands
 @bot.command(name="automod")
@@ -502,7 +976,7 @@ async def join_channel(ctx, channel_id: int):
         await ctx.send(f"✅ Connected to {channel.name}")
     except Exception as e:
         await ctx.send(f"❌ Error joining channel: {e}")
-        logging.error(f"Join channel error: {e}")
+        log.error("Join channel error: %s", e)
 
 @bot.command(name="disconnect")
 async def disconnect_command(ctx):
@@ -515,7 +989,7 @@ async def disconnect_command(ctx):
             await ctx.send("ℹ️ I'm not in a voice channel.")
     except Exception as e:
         await ctx.send(f"❌ Error disconnecting: {e}")
-        logging.error(f"Disconnect command error: {e}")
+        log.error("Disconnect command error: %s", e)
 
 # 7. Fun Commands
 @bot.command(name="meme")
@@ -523,75 +997,65 @@ async def disconnect_command(ctx):
 async def meme_command(ctx):
     """Fetch a random meme from the internet."""
     try:
-        response = requests.get("https://meme-api.com/gimme", timeout=5)
-        response.raise_for_status()
-        data = response.json()
+        data = await fetch_json("https://meme-api.com/gimme")
         meme_url = data.get("url", "No meme found")
         await ctx.send(meme_url)
     except Exception as e:
         await ctx.send("❌ Couldn't fetch a meme right now.")
-        logging.error(f"Meme error: {e}")
+        log.error("Meme error: %s", e)
 
 @bot.command(name="joke")
 @commands.cooldown(1, 30, commands.BucketType.user)
 async def joke_command(ctx):
     """Fetch a random joke from the internet."""
     try:
-        response = requests.get("https://official-joke-api.appspot.com/random_joke", timeout=5)
-        response.raise_for_status()
-        data = response.json()
+        data = await fetch_json("https://official-joke-api.appspot.com/random_joke")
         joke_text = f"{data.get('setup', '')} - {data.get('punchline', '')}"
         await ctx.send(joke_text)
     except Exception as e:
         await ctx.send("❌ Couldn't fetch a joke right now.")
-        logging.error(f"Joke error: {e}")
+        log.error("Joke error: %s", e)
 
 @bot.command(name="roast")
 async def roast_command(ctx, member: discord.Member):
     """Roast a tagged user by fetching an insult from the internet."""
     try:
-        response = requests.get("https://evilinsult.com/generate_insult.php?lang=en&type=json", timeout=5)
-        response.raise_for_status()
-        data = response.json()
+        data = await fetch_json("https://evilinsult.com/generate_insult.php?lang=en&type=json")
         roast_text = data.get("insult", "Couldn't fetch a roast!")
         await ctx.send(f"🔥 {member.mention}, {roast_text}")
     except Exception as e:
         await ctx.send("❌ Couldn't fetch a roast right now.")
-        logging.error(f"Roast error: {e}")
+        log.error("Roast error: %s", e)
 
 @bot.command(name="funfact")
 @commands.cooldown(1, 30, commands.BucketType.user)
 async def funfact_command(ctx):
     """Fetch a random fun fact from the internet."""
     try:
-        response = requests.get("https://uselessfacts.jsph.pl/random.json?language=en", timeout=5)
-        response.raise_for_status()
-        data = response.json()
+        data = await fetch_json("https://uselessfacts.jsph.pl/random.json?language=en")
         fact = data.get("text", "No fact found")
         await ctx.send(f"💡 Fun Fact: {fact}")
     except Exception as e:
         await ctx.send("❌ Couldn't fetch a fun fact right now.")
-        logging.error(f"Funfact error: {e}")
+        log.error("Funfact error: %s", e)
 
 @bot.command(name="trivia")
 @commands.cooldown(1, 30, commands.BucketType.user)
 async def trivia_command(ctx):
     """Fetch a gaming trivia question from the internet."""
     try:
-        response = requests.get("https://opentdb.com/api.php?amount=1&category=15", timeout=5)
-        response.raise_for_status()
-        data = response.json()
+        # url3986 encoding decodes with a plain unquote (the default is HTML entities).
+        data = await fetch_json("https://opentdb.com/api.php?amount=1&category=15&encode=url3986")
         question_data = data['results'][0]
-        question_text = question_data['question']
-        incorrect_answers = question_data['incorrect_answers']
-        correct_answer = question_data['correct_answer']
-        options = incorrect_answers + [correct_answer]
-        random.shuffle(options)
+        question_text = unquote(question_data['question'])
+        options = [unquote(answer) for answer in question_data['incorrect_answers']]
+        # Inserting the correct answer at a random index is as uniform as a full shuffle.
+        options.insert(random.randint(0, len(options)), unquote(question_data['correct_answer']))
         options_str = ", ".join(options)
         await ctx.send(f"❓ {question_text}\nOptions: {options_str}")
     except Exception as e:
         await ctx.send("❌ Couldn't fetch trivia.")
-        logging.error(f"Trivia error: {e}")
+        log.error("Trivia error: %s", e)
 
 # 8. Feedback Command
 @bot.command(name="feedback")
@@ -605,7 +1069,7 @@ async def feedback_command(ctx, *, message: str):
         embed = discord.Embed(
             title="New Feedback",
             description=message,
-            color=discord.Color.green(),
+            color=COLOR_GREEN,
             timestamp=datetime.now()
         )
         embed.set_author(name=str(ctx.author),
@@ -614,31 +1078,52 @@ async def feedback_command(ctx, *, message: str):
         await ctx.send("✅ Feedback submitted!")
     except Exception as e:
         await ctx.send("❌ Couldn't submit feedback.")
-        logging.error(f"Feedback error: {e}")
+        log.error("Feedback error: %s", e)
 
 # 9. Server Info Command
+# Rendered serverinfo role lists per guild: {guild_id: (roles_display, role_count)}.
+# Role events keep it current, so entries don't need a TTL.
+_serverinfo_cache = {}
+
 @bot.command(name="serverinfo")
+@commands.max_concurrency(4, commands.BucketType.default, wait=False)  # Bound in-flight renders under spam.
 async def server_info(ctx):
     """Display detailed server information."""
     try:
         guild = ctx.guild
-        embed = discord.Embed(title="🏰 Server Information", color=discord.Color.blurple())
+        embed = discord.Embed(title="🏰 Server Information", color=COLOR_BLURPLE)
         embed.add_field(name="Server Name", value=guild.name, inline=True)
         embed.add_field(name="Member Count", value=guild.member_count, inline=True)
-        embed.add_field(name="Owner", value=(guild.owner.mention if guild.owner else "N/A"), inline=True)
-        embed.add_field(name="Created At", value=guild.created_at.strftime("%Y-%m-%d"), inline=True)
+        embed.add_field(name="Owner", value=(f"<@{guild.owner_id}>" if guild.owner_id else "N/A"), inline=True)
+        embed.add_field(name="Created At", value=f"<t:{int(guild.created_at.timestamp())}:D>", inline=True)
         embed.add_field(name="Boost Level", value=f"Level {guild.premium_tier}", inline=True)
         embed.add_field(name="Boosts", value=guild.premium_subscription_count, inline=True)
-        roles = [role.mention for role in guild.roles if not role.is_default()]
-        role_count = len(roles)
-        roles_display = ", ".join(roles[:5]) + (f"\n+{role_count-5} more..." if role_count > 5 else "")
+        # Only the role list is cached; the cheap counters above stay live.
+        cached = _serverinfo_cache.get(guild.id)
+        if cached:
+            roles_display, role_count = cached
+        else:
+            # Only the first 5 roles are shown, so don't render a mention for every role.
+            roles = (role for role in guild.roles if not role.is_default())
+            shown = list(islice(roles, 5))
+            role_count = len(guild.roles) - 1  # excludes @everyone
+            extra = role_count - len(shown)
+            roles_display = ", ".join(role.mention for role in shown) + (f"\n+{extra} more..." if extra > 0 else "")
+            _serverinfo_cache[guild.id] = (roles_display, role_count)
         embed.add_field(name=f"Roles ({role_count})", value=(roles_display if roles_display else "None"), inline=False)
         if guild.icon:
             embed.set_thumbnail(url=guild.icon.url)
         await ctx.send(embed=embed)
     except Exception as e:
         await ctx.send("❌ Couldn't fetch server info.")
-        logging.error(f"Server info error: {e}")
+        log.error("Server info error: %s", e)
+
+@server_info.error
+async def server_info_error(ctx, error):
+    if isinstance(error, commands.MaxConcurrencyReached):
+        await ctx.send("⏳ Busy building server info, please retry in a moment.")
+    else:
+        log.error("Server info error: %s", error)
 
 # 10. Moderation Commands (Mute, Logs, and Warning System)
 @bot.command(name="mute")
@@ -649,14 +1134,14 @@ async def mute_command(ctx, member: discord.Member):
         if not member.voice or not member.voice.channel:
             await ctx.send(f"ℹ️ {member.mention} is not in a voice channel!")
             return
-        await member.edit(mute=True)
+        await _rl_safe(lambda: member.edit(mute=True))
         await ctx.send(f"🔇 {member.mention} has been muted.")
-        db.add_mod_log(f"{member.name} was muted by {ctx.author.name}")
+        db.add_mod_log(f"{member.name} was muted by {ctx.author.name}", user_id=member.id)
     except discord.Forbidden:
         await ctx.send("⚠️ I don't have permission to mute members!")
     except Exception as e:
         await ctx.send(f"❌ Error: {e}")
-        logging.error(f"Mute error: {e}")
+        log.error("Mute error: %s", e)
 
 @bot.command(name="logs")
 async def logs_command(ctx):
@@ -665,36 +1150,26 @@ async def logs_command(ctx):
     Pagination is used if there are more than 5 logs.
     """
     try:
-        logs_data = db.execute("SELECT action, timestamp FROM mod_logs ORDER BY id DESC", fetch=True)
+        logs_data = await cached_rows("logs", db.get_mod_logs)
         if not logs_data:
             await ctx.send("📜 No logs available.")
             return
-        
-        # Paginate logs: 5 logs per page
-        per_page = 5
-        pages = []
-        for i in range(0, len(logs_data), per_page):
-            page_logs = logs_data[i:i+per_page]
-            log_messages = "\n".join([f"{timestamp}: {action}" for action, timestamp in page_logs])
-            embed = discord.Embed(title="📜 Moderation Logs", description=log_messages, color=discord.Color.dark_gray())
-            embed.set_footer(text=f"Page {i//per_page + 1} of {((len(logs_data)-1)//per_page)+1}")
-            pages.append(embed)
-        await paginate(ctx, pages)
+        await paginate(ctx, lambda i: build_log_page(logs_data, i), page_count(logs_data))
     except Exception as e:
         await ctx.send(f"❌ Error fetching logs: {e}")
-        logging.error(f"Logs error: {e}")
+        log.error("Logs error: %s", e)
 
 @bot.command(name="warn")
 @commands.has_permissions(manage_messages=True)
 async def warn_command(ctx, member: discord.Member, *, reason: str):
     """Issues a warning. Usage: !warn @member <reason>"""
     try:
-        db.add_mod_log(f"{member.name} was warned by {ctx.author.name} for: {reason}")
+        db.add_mod_log(f"{member.name} was warned by {ctx.author.name} for: {reason}", user_id=member.id)
         await ctx.send(f"⚠️ {member.mention} has been warned for: {reason}")
         db.add_warning(member.id, reason)
     except Exception as e:
         await ctx.send(f"❌ Error issuing warning: {e}")
-        logging.error(f"Warn command error: {e}")
+        log.error("Warn command error: %s", e)
 
 @bot.command(name="warnings")
 @commands.has_permissions(manage_messages=True)
@@ -705,18 +1180,18 @@ async def warnings_command(ctx, member: discord.Member):
         await ctx.send(f"⚠️ {member.mention} has {count} warning(s).")
     except Exception as e:
         await ctx.send(f"❌ Error fetching warnings: {e}")
-        logging.error(f"Warnings command error: {e}")
+        log.error("Warnings command error: %s", e)
 
 @bot.command(name="clearwarns")
 @commands.has_permissions(manage_messages=True)
 async def clearwarns_command(ctx, member: discord.Member):
     """Clears all warnings for the mentioned user. Usage: !clearwarns @member"""
     try:
-        db.clear_warnings(member.id)
+        await asyncio.to_thread(db.clear_warnings, member.id)
         await ctx.send(f"✅ Warnings for {member.mention} have been cleared.")
     except Exception as e:
         await ctx.send(f"❌ Error clearing warnings: {e}")
-        logging.error(f"Clearwarns command error: {e}")
+        log.error("Clearwarns command error: %s", e)
 
 # 11. Utility Command
 @bot.command(name="ping")
@@ -725,43 +1200,144 @@ async def ping_command(ctx):
     await ctx.send(f"Pong! {round(bot.latency * 1000)}ms")
 
 # -------------------- Global on_message for Auto-Moderation --------------------
+_last_warned = OrderedDict()  # {user_id: datetime or None}, least recently used first
+
+async def get_last_warned(user_id):
+    """Return when user_id was last auto-warned (None if never), reading through the LRU."""
+    if user_id in _last_warned:
+        _last_warned.move_to_end(user_id)
+        return _last_warned[user_id]
+    last_warned_str = await asyncio.to_thread(db.get_last_warning, user_id)
+    if user_id in _last_warned:
+        # Another message from this user was handled while we were reading.
+        return _last_warned[user_id]
+    last_warned = datetime.fromisoformat(last_warned_str) if last_warned_str else None
+    _remember_last_warned(user_id, last_warned)
+    return last_warned
+
+async def set_last_warned(user_id, when):
+    # Update the LRU before awaiting so concurrent messages see the new cooldown.
+    _remember_last_warned(user_id, when)
+    await asyncio.to_thread(db.update_last_warning, user_id, when.isoformat())
+
+def _remember_last_warned(user_id, when):
+    _last_warned[user_id] = when
+    _last_warned.move_to_end(user_id)
+    if len(_last_warned) > LAST_WARNED_CACHE_SIZE:
+        _last_warned.popitem(last=False)
+
 @bot.event
 async def on_message(message):
     if message.author.bot:
         return
     if AUTO_MODERATION_ENABLED:
-        if bad_words_pattern.search(message.content):
+        if contains_bad_word(message.content):
             try:
                 await message.delete()
-                db.add_mod_log(f"Deleted message from {message.author.name}: {message.content}")
+                db.add_mod_log(f"Deleted message from {message.author.name}",
+                               user_id=message.author.id, content=message.content)
                 now = datetime.utcnow()
-                # Use persistent cooldown from the database:
-                last_warned_str = db.get_last_warning(message.author.id)
-                last_warned = datetime.fromisoformat(last_warned_str) if last_warned_str else None
+                # Persistent cooldown (database, cached in a bounded LRU):
+                last_warned = await get_last_warned(message.author.id)
                 if not last_warned or (now - last_warned).total_seconds() >= WARNING_COOLDOWN:
                     db.add_warning(message.author.id, "Bad word usage")
-                    db.update_last_warning(message.author.id, now.isoformat())
+                    await set_last_warned(message.author.id, now)
                 await message.channel.send(f"🚫 {message.author.mention}, that message is not allowed.", delete_after=5)
             except Exception as e:
-                logging.error(f"Error auto-deleting message: {e}")
+                log.error("Error auto-deleting message: %s", e)
     await bot.process_commands(message)
 
 # -------------------- on_voice_state_update Event --------------------
+# Set in on_ready; avoids resolving bot.user on every voice event.
+_BOT_USER_ID = None
+
 @bot.event
 async def on_voice_state_update(member, before, after):
-    # If the bot itself was disconnected from the default 24/7 channel, attempt reconnection.
-    if member == bot.user:
-        if before.channel and not after.channel and before.channel.id == DEFAULT_VOICE_CHANNEL_ID:
-            logging.info("Bot was disconnected from default voice channel; attempting reconnection.")
-            await asyncio.sleep(5)
-            await maintain_default_voice_connection()
+    # Fires for every member in every guild; bail out before doing any other work.
+    if member.id != _BOT_USER_ID:
+        return
+    # If the bot left voice entirely (kicked, network drop, or after a !coach session),
+    # head back to the default 24/7 channel.
+    if before.channel and not after.channel:
+        log.info("Bot was disconnected from voice; reconnecting to the default channel.")
+        schedule_voice_reconnect()
+
+@bot.event
+async def on_resumed():
+    # Voice can drop while the gateway session is interrupted.
+    schedule_voice_reconnect()
+
+# -------------------- Channel Cache Invalidation --------------------
+@bot.event
+async def on_guild_channel_delete(channel):
+    global _cached_vc
+    if channel.id == DEFAULT_VOICE_CHANNEL_ID:
+        _cached_vc = None
+
+@bot.event
+async def on_guild_channel_update(before, after):
+    global _cached_vc
+    if after.id == DEFAULT_VOICE_CHANNEL_ID:
+        _cached_vc = None
+
+# -------------------- Server Info Cache Invalidation --------------------
+@bot.event
+async def on_guild_role_create(role):
+    _serverinfo_cache.pop(role.guild.id, None)
+
+@bot.event
+async def on_guild_role_delete(role):
+    _serverinfo_cache.pop(role.guild.id, None)
+
+@bot.event
+async def on_guild_role_update(before, after):
+    _serverinfo_cache.pop(after.guild.id, None)
 
 # -------------------- on_ready Event --------------------
 @bot.event
 async def on_ready():
-    logging.info(f"✅ Logged in as {bot.user}")
-    maintain_default_voice_connection.start()
+    global _BOT_USER_ID
+    _BOT_USER_ID = bot.user.id
+    log.info("✅ Logged in as %s", bot.user)
+    # on_ready fires again after gateway reconnects; only start the loops once.
+    if not flush_database_writes.is_running():
+        flush_database_writes.start()
+    if not maintain_default_voice_connection.is_running():
+        maintain_default_voice_connection.start()
+    else:
+        # A fresh session (not a resume) drops voice connections; rejoin without
+        # waiting for the next watchdog tick.
+        schedule_voice_reconnect()
+    if not prune_warning_cooldowns.is_running():
+        prune_warning_cooldowns.start()
 
 # -------------------- Run Bot --------------------
-keep_alive()
-bot.run(TOKEN)
+try:
+    import uvloop  # libuv-based event loop; not available on Windows.
+    asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+except ImportError:
+    log.info("uvloop not installed; using the default asyncio event loop.")
+
+async def main():
+    # Hosts stop the bot with SIGTERM; shut down cleanly so queued DB rows get flushed.
+    try:
+        asyncio.get_running_loop().add_signal_handler(signal.SIGTERM, lambda: asyncio.create_task(bot.close()))
+    except NotImplementedError:
+        pass  # Not supported on Windows event loops.
+    # The uptime endpoint shares the bot's event loop instead of running its own thread.
+    web_runner = await keep_alive()
+    timeout = aiohttp.ClientTimeout(total=HTTP_TIMEOUT)
+    connector = aiohttp.TCPConnector(limit_per_host=HTTP_LIMIT_PER_HOST)
+    try:
+        async with aiohttp.ClientSession(timeout=timeout, connector=connector) as session:
+            bot.http_session = session
+            async with bot:
+                await bot.start(TOKEN)
+    finally:
+        await web_runner.cleanup()
+
+try:
+    asyncio.run(main())
+except KeyboardInterrupt:
+    pass
+db.close()  # Flushes rows queued after the last flush tick.
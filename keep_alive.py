@@ -1,17 +1,15 @@
-from flask import Flask
-from threading import Thread
+from aiohttp import web
 import os
 
-app = Flask(__name__)
+async def home(request):
+    return web.Response(text="Bot is alive!")
 
-@app.route('/')
-def home():
-    return "Bot is alive!"
-
-def run():
+async def keep_alive():
+    """Serve the uptime endpoint on the running event loop; returns the runner to clean up."""
+    app = web.Application()
+    app.router.add_get('/', home)
+    runner = web.AppRunner(app, access_log=None)
+    await runner.setup()
     port = int(os.getenv("PORT", 8080))  # Dynamic port for hosting services
-    app.run(host="0.0.0.0", port=port)
-
-def keep_alive():
-    t = Thread(target=run)
-    t.start()
+    await web.TCPSite(runner, host="0.0.0.0", port=port).start()
+    return runner